@@ -3,6 +3,7 @@ import instantsearch from 'instantsearch.js';
 import {
   searchBox,
   hits,
+  index,
   stats,
   configure,
   pagination,
@@ -105,4 +106,36 @@ search.addWidgets([
   }),
 ]);
 
+// column records are in their own index, optionally built by the indexer
+// the index widget inherits the query and refinements of the main index
+if (process.env.ALGOLIA_COLUMN_INDEX_NAME) {
+  document.querySelector('#column-hits-title').hidden = false;
+  search.addWidgets([
+    index({ indexName: process.env.ALGOLIA_COLUMN_INDEX_NAME }).addWidgets([
+      hits({
+        container: '#column-hits',
+        templates: {
+          item(hit) {
+            return `<article>
+                    <h2 class="hit-name">${hit._highlightResult.name.value}</h2>
+                    <p class="hit-description">${
+                      hit._highlightResult.description.value
+                    }</p>
+                    <dl class="hit-metadata">
+                        <dt>dataset:</dt>
+                        <dd>${hit._highlightResult.node_name.value}</dd>
+                        <dt>folder:</dt>
+                        <dd>${hit._highlightResult.folder.value}</dd>
+                    </dl>
+                    </article>`;
+          },
+        },
+      }),
+      configure({
+        hitsPerPage: 5,
+      }),
+    ]),
+  ]);
+}
+
 search.start();
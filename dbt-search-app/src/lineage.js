@@ -0,0 +1,23 @@
+// Resolve the precomputed lineage files written by `python -m dbt_metadata_utils.lineage`
+// and served by nginx under /lineage/.
+
+// 32-bit FNV-1a hash of the utf-8 node id, modulo 256, as 2 hex digits.
+// Must stay in sync with get_lineage_shard in dbt_metadata_utils/lineage.py.
+export function getLineageShard(nodeId) {
+  let hash = 0x811c9dc5;
+  for (const byte of new TextEncoder().encode(nodeId)) {
+    hash = Math.imul(hash ^ byte, 0x01000193) >>> 0;
+  }
+  return (hash % 256).toString(16).padStart(2, '0');
+}
+
+// nginx serves the .json.gz file for this .json url
+export function getLineagePath(nodeId) {
+  return `/lineage/${getLineageShard(nodeId)}/${nodeId}.json`;
+}
+
+// upstream and downstream neighbourhood of a node, or null if it was not exported
+export async function fetchLineage(nodeId) {
+  const response = await fetch(getLineagePath(nodeId));
+  return response.ok ? response.json() : null;
+}
@@ -3,15 +3,23 @@ import json
 
 from datetime import datetime
 from glob import glob
-from typing import Any, Dict, List, Optional
+from hashlib import md5
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import networkx as nx
 
 from algoliasearch.search_client import SearchClient
+from algoliasearch.search_index import SearchIndex
 from pydantic import BaseModel, root_validator, validator
 
 from dbt_metadata_utils.config import Settings
-from dbt_metadata_utils.models import DbtMaterializationType, DbtResourceType, GraphManifest
+from dbt_metadata_utils.models import (
+    BaseNode,
+    DbtMaterializationType,
+    DbtResourceType,
+    GraphManifest,
+)
 
 
 class NodeSearch(BaseModel):
@@ -57,10 +65,76 @@ class NodeSearch(BaseModel):
         use_enum_values = True
 
 
-def get_es_records(
+class ColumnSearch(BaseModel):
+    """Model for searchable column document in Algolia."""
+
+    # unique id
+    objectID: str
+    # attributes for search
+    name: str
+    description: str
+    node_name: str
+    # attributes for displaying
+    node_id: str
+    # attributes for filtering, inherited from the parent node
+    resource_type: DbtResourceType
+    materialized: Optional[DbtMaterializationType]
+    sources: Optional[List[str]]
+    folder: str
+    loaders: Optional[List[str]]
+    # attributes for ranking, inherited from the parent node except has_description
+    degree_centrality: float
+    is_in_mart: bool
+    has_description: bool
+
+    @root_validator(pre=True)
+    def parse(cls, values):  # noqa:ANN201,ANN001
+        """Link a column to its parent node."""
+        values["objectID"] = f"{values.get('node_id')}.{values.get('name')}"
+        values["has_description"] = len(values.get("description")) > 20
+        return values
+
+    class Config:  # noqa:D106
+        use_enum_values = True
+
+
+# attributes of a NodeSearch record that are copied on each of its ColumnSearch records
+COLUMN_PARENT_ATTRIBUTES = {
+    "resource_type",
+    "materialized",
+    "sources",
+    "folder",
+    "loaders",
+    "degree_centrality",
+    "is_in_mart",
+}
+
+
+# Dynamic Filtering
+# = Removing filter values from the query string and using them directly as filters
+# shared by the node and column indices, which the search app queries with the same query
+RULES = [
+    {
+        # https://www.algolia.com/doc/api-reference/api-methods/save-rule/#method-param-rule
+        "objectID": "loaders-facets",
+        "description": "Dynamic filtering on loaders",
+        "conditions": [
+            {"anchoring": "contains", "pattern": "{facet:loaders}", "alternatives": True}
+        ],
+        "consequence": {
+            "params": {
+                "query": {"remove": ["{facet:loaders}"]},
+                "automaticFacetFilters": ["loaders"],
+            }
+        },
+    }
+]
+
+
+def iter_node_search(
     manifest: GraphManifest, git_metadata: Dict[str, Dict[str, Any]]
-) -> List[Dict[str, str]]:
-    """Generate ElasticSearch records from the manifest.json data."""
+) -> Iterator[Tuple[BaseNode, NodeSearch]]:
+    """Lazily parse the manifest.json nodes and sources into NodeSearch records."""
     # Build directed graph from manifest.json data
     G = manifest.build_directed_graph()
 
@@ -70,27 +144,147 @@ def get_es_records(
 
     # Parse the nodes data for ElasticSearch and enrich it
     # with centrality and ancestor sources
-    es_records = [
-        NodeSearch(
+    for node_id, node in manifest.nodes.items():
+        yield node, NodeSearch(
             **node.dict(exclude={"sources"}),
             degree_centrality=centrality.get(node_id, 0.0),
             sources=GraphManifest.get_ancestors_sources(node_id, G),
             loaders=manifest.get_ancestors_loaders(node_id, G),
             **git_metadata.get(node_id, dict(owner=None, created_at=None, last_modified_at=None)),
-        ).dict()
-        for node_id, node in manifest.nodes.items()
-    ]
-    es_records += [
-        NodeSearch(
-            **node.dict(exclude={"sources"}),
+        )
+    for node_id, source in manifest.sources.items():
+        yield source, NodeSearch(
+            **source.dict(exclude={"sources"}),
             degree_centrality=centrality.get(node_id, 0.0),
             sources=[GraphManifest.get_folder_from_node_id(node_id)],
-            loaders=[node.loader]
+            loaders=[source.loader]
             # not adding git metadata for sources because there are multiple sources per .yml file
-        ).dict()
-        for node_id, node in manifest.sources.items()
-    ]
-    return es_records
+        )
+
+
+def iter_column_records(
+    node_search: Iterable[Tuple[BaseNode, NodeSearch]]
+) -> Iterator[Dict[str, Any]]:
+    """Stream one search record per column of the manifest.json nodes and sources.
+
+    The parent node attributes (centrality, ancestors sources and loaders, facets)
+    are computed once per node by iter_node_search and shared by all of its columns.
+    """
+    for node, node_record in node_search:
+        parent = node_record.dict(include=COLUMN_PARENT_ATTRIBUTES)
+        for column in node.columns.values():
+            yield ColumnSearch(
+                **parent,
+                **column.dict(),
+                node_id=node.unique_id,
+                node_name=node.name,
+            ).dict()
+
+
+def get_record_hash(record: Dict[str, Any]) -> str:
+    """Hash the content of a search record."""
+    return md5(json.dumps(record, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def filter_unchanged_records(
+    records: Iterable[Dict[str, Any]],
+    previous_hashes: Dict[str, str],
+    current_hashes: Dict[str, str],
+) -> Iterator[Dict[str, Any]]:
+    """Skip records whose content did not change since the previous run.
+
+    Arguments:
+        records: search records, each with an objectID
+        previous_hashes: content hash by objectID, from the previous run
+        current_hashes: filled in place with the content hash of every record seen
+
+    Yields:
+        records that are new or whose content changed.
+    """
+    for record in records:
+        record_hash = get_record_hash(record)
+        current_hashes[record["objectID"]] = record_hash
+        if previous_hashes.get(record["objectID"]) != record_hash:
+            yield record
+
+
+def sync_records(index: SearchIndex, records: Iterable[Dict[str, Any]], cache_path: Path) -> None:
+    """Send only new or changed records to an Algolia index, and delete stale ones.
+
+    Arguments:
+        index: Algolia index to update
+        records: all the search records that should be in the index
+        cache_path: json file of the content hash by objectID sent on the previous run
+    """
+    previous_hashes: Dict[str, str] = {}
+    if cache_path.exists():
+        with cache_path.open() as fh:
+            previous_hashes = json.load(fh)
+
+    current_hashes: Dict[str, str] = {}
+    if previous_hashes:
+        existing_ids = {
+            hit["objectID"] for hit in index.browse_objects({"attributesToRetrieve": ["objectID"]})
+        }
+        # only trust the cache for records that are still in the index,
+        # e.g. a cleared index gets all its records again
+        previous_hashes = {k: v for k, v in previous_hashes.items() if k in existing_ids}
+        index.save_objects(filter_unchanged_records(records, previous_hashes, current_hashes))
+
+        # records that were removed or renamed since the previous run
+        stale_ids = list(existing_ids - current_hashes.keys())
+        if stale_ids:
+            index.delete_objects(stale_ids)
+    else:
+        # without a cache, we can't tell which records in the index are stale
+        index.replace_all_objects(filter_unchanged_records(records, {}, current_hashes))
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with cache_path.open("w") as fh:
+        json.dump(current_hashes, fh)
+
+
+def update_column_index(
+    client: SearchClient,
+    settings: Settings,
+    node_search: Iterable[Tuple[BaseNode, NodeSearch]],
+) -> None:
+    """Stream column records into their own Algolia index, only sending changed ones."""
+    index = client.init_index(settings.algolia_column_index_name)
+
+    index.set_settings(
+        {
+            "searchableAttributes": ["name,description", "node_name", "folder,sources"],
+            "attributesForFaceting": [
+                "resource_type",
+                "materialized",
+                "searchable(folder)",
+                "searchable(sources)",
+                "searchable(node_name)",
+                "loaders",
+            ],
+            "ranking": [
+                # columns inherit the centrality of their parent node
+                "desc(degree_centrality)",
+                "typo",
+                "words",
+                "filters",
+                "proximity",
+                "attribute",
+                "exact",
+                "custom",
+            ],
+            "customRanking": ["desc(is_in_mart)", "desc(has_description)"],
+        }
+    )
+    index.save_rules(RULES)
+
+    # one cache per index, so that a renamed index gets all its records
+    cache_path = (
+        settings.column_hashes_cache_path.expanduser()
+        / f"{settings.algolia_column_index_name}.json"
+    )
+    sync_records(index, iter_column_records(node_search), cache_path)
 
 
 if __name__ == "__main__":
@@ -117,9 +311,10 @@ if __name__ == "__main__":
 
         git_metadata[node_id] = {k: v for k, v in data.items() if k != "commits"}
 
-    es_records = get_es_records(m, git_metadata)
+    # computed once and shared by the node and column indices
+    node_search = list(iter_node_search(m, git_metadata))
 
-    index.save_objects(es_records)
+    index.save_objects(record.dict() for _, record in node_search)
 
     index.set_settings(
         # https://www.algolia.com/doc/api-reference/settings-api-parameters/
@@ -152,23 +347,7 @@ if __name__ == "__main__":
         }
     )
 
-    # Dynamic Filtering
-    # = Removing filter values from the query string and using them directly as filters
-    index.save_rules(
-        [
-            {
-                # https://www.algolia.com/doc/api-reference/api-methods/save-rule/#method-param-rule
-                "objectID": "loaders-facets",
-                "description": "Dynamic filtering on loaders",
-                "conditions": [
-                    {"anchoring": "contains", "pattern": "{facet:loaders}", "alternatives": True}
-                ],
-                "consequence": {
-                    "params": {
-                        "query": {"remove": ["{facet:loaders}"]},
-                        "automaticFacetFilters": ["loaders"],
-                    }
-                },
-            }
-        ]
-    )
+    index.save_rules(RULES)
+
+    if settings.algolia_index_columns:
+        update_column_index(client, settings, node_search)
@@ -13,6 +13,11 @@ class Settings(BaseSettings):
 
     algolia_index_name: str = "dbt_nodes"
 
+    # optional column-level records, indexed separately from nodes
+    algolia_index_columns: bool = False
+    algolia_column_index_name: str = "dbt_columns"
+    column_hashes_cache_path: Path = Path("data/column_hashes")
+
     dbt_manifest_path: Path = Path("data/manifest.json")
 
     algolia_search_only_api_key: Optional[str]
@@ -20,6 +25,12 @@ class Settings(BaseSettings):
     dbt_repo_local_path: Path
     git_metadata_cache_path: Path = Path("data/git_metadata")
 
+    # precomputed lineage neighbourhoods served as static files by the frontend
+    lineage_export_path: Path = Path("data/lineage")
+    lineage_hashes_cache_path: Path = Path("data/lineage_hashes")
+    lineage_max_hops: int = 2
+    lineage_max_nodes: int = 50
+
     class Config:  # noqa:D106
         env_file = ".env"
         env_file_encoding = "utf-8"
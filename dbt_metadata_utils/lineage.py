@@ -0,0 +1,156 @@
+"""Export precomputed lineage of the dbt nodes as static files for the search app."""
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from dbt_metadata_utils.config import Settings
+from dbt_metadata_utils.models import GraphManifest
+
+
+def get_lineage_shard(node_id: str) -> str:
+    """Get the shard folder of a node lineage export.
+
+    Uses the 32-bit FNV-1a hash of the utf-8 node id, so that the search app can compute it too,
+    see getLineageShard in dbt-search-app/src/lineage.js.
+
+    Arguments:
+        node_id: node id as defined in the dbt artifacts
+
+    Returns:
+        the hash modulo 256, as 2 hex digits.
+    """
+    h = 0x811C9DC5
+    for byte in node_id.encode("utf-8"):
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return f"{h % 256:02x}"
+
+
+def get_lineage_path(output_path: Path, node_id: str) -> Path:
+    """Get the file path of a node lineage export.
+
+    Arguments:
+        output_path: root folder of the lineage export
+        node_id: node id as defined in the dbt artifacts
+
+    Returns:
+        gzipped json file path, in the shard folder of the node.
+    """
+    return output_path / get_lineage_shard(node_id) / f"{node_id}.json.gz"
+
+
+def write_gzip(file_path: Path, content: bytes) -> None:
+    """Write content to a gzip file, reproducibly and atomically."""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    buffer = io.BytesIO()
+    # mtime=0 so that the same content always gives the same bytes
+    with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gz:
+        gz.write(content)
+    # the export folder is served while we write, so never expose a partially written file
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(buffer.getvalue())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def remove_lineage_file(output_path: Path, file_path: Path) -> None:
+    """Delete a lineage file and its parent folders left empty, up to output_path."""
+    if file_path.exists():
+        file_path.unlink()
+    folder = file_path.parent
+    while folder != output_path and folder.exists() and not any(folder.iterdir()):
+        folder.rmdir()
+        folder = folder.parent
+
+
+def export_lineage(
+    manifest: GraphManifest,
+    output_path: Path,
+    hashes_path: Path,
+    k: int = 2,
+    max_nodes: int = 50,
+    max_workers: int = 8,
+) -> int:
+    """Write the lineage neighbourhood of each node as static gzipped json files.
+
+    Only the files of nodes whose lineage changed since the previous export are rewritten,
+    and the files of nodes that are no longer in the manifest are deleted.
+    Without a hashes cache, every file is rewritten and the export folder is scanned
+    for stale files instead.
+
+    Arguments:
+        manifest: parsed manifest.json
+        output_path: root folder of the lineage export, served as static files
+        hashes_path: json file of the content hash by node id, kept outside of output_path
+        k: maximum number of hops away from each node
+        max_nodes: maximum number of neighbours in each direction
+        max_workers: number of threads writing files
+
+    Returns:
+        number of files written.
+    """
+    previous_hashes: Dict[str, str] = {}
+    if hashes_path.exists():
+        with hashes_path.open() as fh:
+            previous_hashes = json.load(fh)
+
+    G = manifest.build_directed_graph()
+
+    current_hashes: Dict[str, str] = {}
+    changed: List[Tuple[Path, bytes]] = []
+    for lineage in manifest.iter_lineage(G, k, max_nodes):
+        content = lineage.json(sort_keys=True).encode("utf-8")
+        content_hash = md5(content).hexdigest()
+        current_hashes[lineage.unique_id] = content_hash
+        file_path = get_lineage_path(output_path, lineage.unique_id)
+        if previous_hashes.get(lineage.unique_id) != content_hash or not file_path.exists():
+            changed.append((file_path, content))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # consume the results so that exceptions are raised
+        list(executor.map(lambda args: write_gzip(*args), changed))
+
+    # nodes that were removed or renamed since the previous export
+    for node_id in previous_hashes.keys() - current_hashes.keys():
+        remove_lineage_file(output_path, get_lineage_path(output_path, node_id))
+    if not previous_hashes:
+        # without a cache, look for stale files in the export folder itself
+        for file_path in list(output_path.rglob("*.json.gz")):
+            node_id = file_path.name[: -len(".json.gz")]
+            # also catches files of a previous shard layout
+            is_stale = node_id not in current_hashes
+            if is_stale or file_path != get_lineage_path(output_path, node_id):
+                remove_lineage_file(output_path, file_path)
+
+    hashes_path.parent.mkdir(parents=True, exist_ok=True)
+    with hashes_path.open("w") as fh:
+        json.dump(current_hashes, fh)
+
+    return len(changed)
+
+
+if __name__ == "__main__":
+    settings = Settings()
+
+    with settings.dbt_manifest_path.expanduser().open() as fh:
+        data = json.load(fh)
+
+    m = GraphManifest(**data)
+
+    export_lineage(
+        m,
+        settings.lineage_export_path.expanduser(),
+        settings.lineage_hashes_cache_path.expanduser() / "hashes.json",
+        k=settings.lineage_max_hops,
+        max_nodes=settings.lineage_max_nodes,
+    )
@@ -3,7 +3,7 @@ import json
 
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 import networkx as nx
 
@@ -118,6 +118,19 @@ class Manifest(BaseModel):
         }
 
 
+class NodeLineage(BaseModel):
+    """Precomputed lineage neighbourhood of a dbt node."""
+
+    unique_id: str
+    # hop distance by node id, for up to k hops away from the node
+    upstream: Dict[str, int]
+    downstream: Dict[str, int]
+    # edges between all the nodes of the neighbourhood
+    edges: List[Tuple[str, str]]
+    # whether the neighbourhood was capped before reaching k hops
+    truncated: bool
+
+
 class GraphManifest(Manifest):
     """A parser for manifest.json, augmented with Graph logic."""
 
@@ -200,6 +213,69 @@ class GraphManifest(Manifest):
         """
         return node_id.split(".")[2]
 
+    @staticmethod
+    def get_k_hop_neighbours(
+        node_id: str, G: nx.DiGraph, k: int, max_nodes: int, upstream: bool
+    ) -> Tuple[Dict[str, int], bool]:
+        """Get the nodes at most k hops upstream or downstream of a dbt node.
+
+        Arguments:
+            node_id: node id as defined in the dbt artifacts
+            G: directed networkx graph of the dbt project
+            k: maximum number of hops away from the node
+            max_nodes: maximum number of neighbours returned
+            upstream: whether to walk the graph upstream or downstream
+
+        Returns:
+            hop distance by neighbour node id, and whether max_nodes was reached.
+        """
+        neighbours: Dict[str, int] = {}
+        if node_id not in G:
+            return neighbours, False
+
+        get_next = G.predecessors if upstream else G.successors
+        frontier = [node_id]
+        # breadth-first so that the closest neighbours are kept when capping
+        for depth in range(1, k + 1):
+            next_frontier = []
+            for n in frontier:
+                for neighbour in get_next(n):
+                    if neighbour == node_id or neighbour in neighbours:
+                        continue
+                    if len(neighbours) >= max_nodes:
+                        return neighbours, True
+                    neighbours[neighbour] = depth
+                    next_frontier.append(neighbour)
+            frontier = next_frontier
+        return neighbours, False
+
+    def iter_lineage(self, G: nx.DiGraph, k: int, max_nodes: int) -> Iterator[NodeLineage]:
+        """Compute the capped k-hop lineage neighbourhood of every node and source.
+
+        Arguments:
+            G: directed networkx graph of the dbt project
+            k: maximum number of hops away from each node
+            max_nodes: maximum number of neighbours in each direction
+
+        Yields:
+            lineage neighbourhood of each node.
+        """
+        for node_id in self.node_list:
+            upstream, upstream_truncated = self.get_k_hop_neighbours(
+                node_id, G, k, max_nodes, upstream=True
+            )
+            downstream, downstream_truncated = self.get_k_hop_neighbours(
+                node_id, G, k, max_nodes, upstream=False
+            )
+            neighbourhood = {node_id, *upstream, *downstream}
+            yield NodeLineage(
+                unique_id=node_id,
+                upstream=upstream,
+                downstream=downstream,
+                edges=sorted(G.subgraph(neighbourhood).edges),
+                truncated=upstream_truncated or downstream_truncated,
+            )
+
 
 if __name__ == "__main__":
     with open("data/manifest.json") as fh:
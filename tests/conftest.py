@@ -0,0 +1,50 @@
+"""Shared fixtures for the tests."""
+from typing import Any, Dict, List
+
+import pytest
+
+from dbt_metadata_utils.models import GraphManifest
+
+
+def make_node(unique_id: str, depends_on: List[str], columns: List[str] = ()) -> Dict[str, Any]:
+    """Build a minimal manifest.json model node."""
+    return dict(
+        columns={c: dict(name=c, description=f"{c} column of {unique_id}") for c in columns},
+        config=dict(enabled=True, materialized="view"),
+        description="",
+        fqn=unique_id.split(".")[1:],
+        name=unique_id.split(".")[-1],
+        original_file_path=f"models/{unique_id}.sql",
+        path=f"{unique_id}.sql",
+        resource_type="model",
+        schema="analytics",
+        tags=[],
+        unique_id=unique_id,
+        depends_on=dict(nodes=depends_on),
+        sources=[],
+    )
+
+
+def make_source(unique_id: str, columns: List[str] = ()) -> Dict[str, Any]:
+    """Build a minimal manifest.json source."""
+    source = make_node(unique_id, [], columns)
+    del source["depends_on"], source["sources"]
+    source.update(resource_type="source", identifier=source["name"], loader="fivetran")
+    source["config"]["materialized"] = None
+    return source
+
+
+@pytest.fixture
+def manifest() -> GraphManifest:
+    """Small dbt project: raw.orders -> stg.orders -> marts.orders -> marts.revenue."""
+    return GraphManifest(
+        nodes={
+            n["unique_id"]: n
+            for n in [
+                make_node("model.shop.stg.orders", ["source.shop.raw.orders"], ["id", "amount"]),
+                make_node("model.shop.marts.orders", ["model.shop.stg.orders"], ["id"]),
+                make_node("model.shop.marts.revenue", ["model.shop.marts.orders"]),
+            ]
+        },
+        sources={"source.shop.raw.orders": make_source("source.shop.raw.orders", ["id"])},
+    )
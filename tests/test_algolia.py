@@ -0,0 +1,141 @@
+"""Tests for the Algolia records of nodes and columns."""
+import json
+
+from dbt_metadata_utils.algolia import (
+    RULES,
+    filter_unchanged_records,
+    iter_column_records,
+    iter_node_search,
+    sync_records,
+    update_column_index,
+)
+from dbt_metadata_utils.config import Settings
+
+
+class FakeIndex:
+    """In-memory stand-in for an Algolia SearchIndex."""
+
+    def __init__(self, objects=None):
+        self.objects = dict(objects or {})
+        self.saved = []
+        self.deleted = []
+        self.rules = []
+
+    def set_settings(self, settings):
+        pass
+
+    def save_rules(self, rules):
+        self.rules = rules
+
+    def browse_objects(self, request_options=None):
+        return [{"objectID": object_id} for object_id in self.objects]
+
+    def save_objects(self, objects):
+        for obj in objects:
+            self.saved.append(obj["objectID"])
+            self.objects[obj["objectID"]] = obj
+
+    def replace_all_objects(self, objects):
+        self.objects = {}
+        self.save_objects(objects)
+
+    def delete_objects(self, object_ids):
+        for object_id in object_ids:
+            self.deleted.append(object_id)
+            del self.objects[object_id]
+
+
+class FakeClient:
+    def __init__(self):
+        self.indices = {}
+
+    def init_index(self, name):
+        return self.indices.setdefault(name, FakeIndex())
+
+
+def test_iter_column_records_inherits_parent_attributes(manifest):
+    records = {r["objectID"]: r for r in iter_column_records(iter_node_search(manifest, {}))}
+
+    assert set(records) == {
+        "model.shop.stg.orders.id",
+        "model.shop.stg.orders.amount",
+        "model.shop.marts.orders.id",
+        "source.shop.raw.orders.id",
+    }
+    record = records["model.shop.marts.orders.id"]
+    assert record["node_name"] == "orders"
+    assert record["is_in_mart"] is True
+    assert record["sources"] == ["raw"]
+    assert record["loaders"] == ["fivetran"]
+    assert record["has_description"] is True
+
+
+def test_filter_unchanged_records():
+    records = [{"objectID": "a", "v": 1}, {"objectID": "b", "v": 1}]
+    hashes = {}
+    assert list(filter_unchanged_records(records, {}, hashes)) == records
+    assert set(hashes) == {"a", "b"}
+
+    records[1]["v"] = 2
+    new_hashes = {}
+    assert list(filter_unchanged_records(records, hashes, new_hashes)) == [records[1]]
+    assert new_hashes["a"] == hashes["a"]
+    assert new_hashes["b"] != hashes["b"]
+
+
+def test_sync_records_without_cache_replaces_index(tmp_path):
+    index = FakeIndex({"stale": {"objectID": "stale"}})
+
+    sync_records(index, [{"objectID": "a"}], tmp_path / "hashes.json")
+
+    assert set(index.objects) == {"a"}
+    assert set(json.loads((tmp_path / "hashes.json").read_text())) == {"a"}
+
+
+def test_sync_records_sends_changes_and_deletes_stale(tmp_path):
+    cache_path = tmp_path / "hashes.json"
+    index = FakeIndex()
+    sync_records(index, [{"objectID": "a", "v": 1}, {"objectID": "b", "v": 1}], cache_path)
+    index.saved = []
+
+    sync_records(index, [{"objectID": "a", "v": 2}, {"objectID": "c", "v": 1}], cache_path)
+
+    assert index.saved == ["a", "c"]
+    assert index.deleted == ["b"]
+    assert set(index.objects) == {"a", "c"}
+
+
+def test_sync_records_resends_records_missing_from_index(tmp_path):
+    cache_path = tmp_path / "hashes.json"
+    records = [{"objectID": "a"}, {"objectID": "b"}]
+    index = FakeIndex()
+    sync_records(index, records, cache_path)
+
+    # e.g. the index was cleared from the Algolia dashboard
+    del index.objects["b"]
+    index.saved = []
+    sync_records(index, records, cache_path)
+
+    assert index.saved == ["b"]
+    assert set(index.objects) == {"a", "b"}
+
+
+def test_update_column_index_caches_per_index_name(manifest, tmp_path):
+    client = FakeClient()
+    node_search = list(iter_node_search(manifest, {}))
+    for index_name in ("columns_v1", "columns_v2"):
+        settings = Settings(
+            algolia_admin_api_key="key",
+            algolia_app_id="app",
+            dbt_repo_local_path=tmp_path,
+            algolia_column_index_name=index_name,
+            column_hashes_cache_path=tmp_path,
+        )
+        update_column_index(client, settings, node_search)
+
+    assert len(client.indices["columns_v1"].objects) == 4
+    assert len(client.indices["columns_v2"].objects) == 4
+    assert (tmp_path / "columns_v1.json").exists()
+    assert (tmp_path / "columns_v2.json").exists()
+    # same dynamic filtering as the node index, since both get the same query
+    assert client.indices["columns_v1"].rules == RULES
@@ -0,0 +1,88 @@
+"""Tests for the static lineage export."""
+import gzip
+import json
+
+from dbt_metadata_utils.lineage import export_lineage, get_lineage_path, get_lineage_shard
+from dbt_metadata_utils.models import GraphManifest
+
+
+def read_lineage(output_path, node_id):
+    return json.loads(gzip.decompress(get_lineage_path(output_path, node_id).read_bytes()))
+
+
+def test_get_lineage_shard():
+    # same values as getLineageShard in dbt-search-app/src/lineage.js
+    assert get_lineage_shard("model.shop.stg.orders") == "a1"
+    assert get_lineage_shard("source.jaffle_shop.raw.orders") == "24"
+    assert get_lineage_shard("model.é.x") == "7a"
+
+
+def test_export_lineage_writes_one_file_per_node(manifest, tmp_path):
+    output_path, hashes_path = tmp_path / "lineage", tmp_path / "cache" / "hashes.json"
+
+    assert export_lineage(manifest, output_path, hashes_path, k=1) == 4
+
+    assert read_lineage(output_path, "model.shop.stg.orders")["upstream"] == {
+        "source.shop.raw.orders": 1
+    }
+    assert hashes_path.exists()
+    # the hashes cache is not served with the lineage files
+    assert not any(p.name.endswith(".json") for p in output_path.rglob("*"))
+
+
+def test_export_lineage_only_rewrites_changed_nodes(manifest, tmp_path):
+    output_path, hashes_path = tmp_path / "lineage", tmp_path / "hashes.json"
+    export_lineage(manifest, output_path, hashes_path, k=1)
+
+    assert export_lineage(manifest, output_path, hashes_path, k=1) == 0
+    # with 2 hops, only the nodes with neighbours 2 hops away change
+    assert export_lineage(manifest, output_path, hashes_path, k=2) == 4
+    assert export_lineage(manifest, output_path, hashes_path, k=3) == 2
+
+    # a deleted file is written again
+    get_lineage_path(output_path, "model.shop.stg.orders").unlink()
+    assert export_lineage(manifest, output_path, hashes_path, k=3) == 1
+
+
+def test_export_lineage_deletes_stale_nodes(manifest, tmp_path):
+    output_path, hashes_path = tmp_path / "lineage", tmp_path / "hashes.json"
+    export_lineage(manifest, output_path, hashes_path)
+    stale_path = get_lineage_path(output_path, "model.shop.marts.revenue")
+
+    data = manifest.dict(by_alias=True)
+    del data["nodes"]["model.shop.marts.revenue"]
+    export_lineage(GraphManifest(**data), output_path, hashes_path)
+
+    assert not stale_path.exists()
+    # the empty shard folder is removed too
+    assert not stale_path.parent.exists()
+    assert read_lineage(output_path, "model.shop.marts.orders")["downstream"] == {}
+
+
+def test_export_lineage_leaves_no_temporary_files(manifest, tmp_path):
+    output_path = tmp_path / "lineage"
+    export_lineage(manifest, output_path, tmp_path / "hashes.json")
+
+    assert {p.name for p in output_path.rglob("*") if p.is_file()} == {
+        f"{node_id}.json.gz" for node_id in manifest.node_list
+    }
+
+
+def test_export_lineage_without_cache_deletes_stale_files(manifest, tmp_path):
+    output_path = tmp_path / "lineage"
+    # files of a deleted node, and of a node in a previous shard layout
+    stale_paths = [
+        get_lineage_path(output_path, "model.shop.marts.deleted"),
+        output_path / "model" / "shop" / "model.shop.marts.orders.json.gz",
+    ]
+    for stale_path in stale_paths:
+        stale_path.parent.mkdir(parents=True, exist_ok=True)
+        stale_path.write_bytes(b"")
+
+    assert export_lineage(manifest, output_path, tmp_path / "hashes.json") == 4
+
+    assert not any(p.exists() for p in stale_paths)
+    assert not (output_path / "model").exists()
+    assert read_lineage(output_path, "model.shop.marts.orders")["unique_id"] == (
+        "model.shop.marts.orders"
+    )
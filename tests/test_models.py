@@ -0,0 +1,61 @@
+"""Tests for the graph logic of the manifest.json models."""
+import networkx as nx
+
+from dbt_metadata_utils.models import GraphManifest
+
+
+def test_get_k_hop_neighbours_depths():
+    G = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "d"), ("a", "c")])
+
+    upstream, truncated = GraphManifest.get_k_hop_neighbours("d", G, 2, 10, upstream=True)
+    assert upstream == {"c": 1, "b": 2, "a": 2}
+    assert truncated is False
+
+    downstream, truncated = GraphManifest.get_k_hop_neighbours("a", G, 1, 10, upstream=False)
+    assert downstream == {"b": 1, "c": 1}
+    assert truncated is False
+
+
+def test_get_k_hop_neighbours_caps_breadth_first():
+    # 'root' has 3 direct children, each with 1 child of its own
+    G = nx.DiGraph(
+        [("root", f"child_{i}") for i in range(3)]
+        + [(f"child_{i}", f"grandchild_{i}") for i in range(3)]
+    )
+
+    downstream, truncated = GraphManifest.get_k_hop_neighbours("root", G, 2, 4, upstream=False)
+
+    assert truncated is True
+    assert len(downstream) == 4
+    # the closest neighbours are kept first
+    assert {n for n, depth in downstream.items() if depth == 1} == {"child_0", "child_1", "child_2"}
+
+
+def test_get_k_hop_neighbours_not_truncated_at_exact_cap():
+    G = nx.DiGraph([("a", "b"), ("a", "c")])
+
+    downstream, truncated = GraphManifest.get_k_hop_neighbours("a", G, 2, 2, upstream=False)
+
+    assert downstream == {"b": 1, "c": 1}
+    assert truncated is False
+
+
+def test_get_k_hop_neighbours_unknown_node():
+    neighbours, truncated = GraphManifest.get_k_hop_neighbours("a", nx.DiGraph(), 2, 10, True)
+
+    assert neighbours == {}
+    assert truncated is False
+
+
+def test_iter_lineage(manifest):
+    G = manifest.build_directed_graph()
+    lineage = {n.unique_id: n for n in manifest.iter_lineage(G, 1, 10)}
+
+    assert set(lineage) == set(manifest.node_list)
+    orders = lineage["model.shop.marts.orders"]
+    assert orders.upstream == {"model.shop.stg.orders": 1}
+    assert orders.downstream == {"model.shop.marts.revenue": 1}
+    assert orders.edges == [
+        ("model.shop.marts.orders", "model.shop.marts.revenue"),
+        ("model.shop.stg.orders", "model.shop.marts.orders"),
+    ]